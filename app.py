@@ -7,17 +7,34 @@ allows players to configure the board size and number of ships via a
 web form, and then play the game through a series of HTTP requests.
 
 The application uses Flask for routing and rendering templates.  Game
-state is stored in the user session, so multiple players can play
-independently without interfering with each other.  You can deploy
-this app to a platform like Heroku by including a ``Procfile`` and
-``requirements.txt`` listing Flask and Gunicorn as dependencies.
+state is kept in process memory, keyed by a random game id stored in
+the user session, so multiple players can play independently without
+interfering with each other.  Because the state lives in the process,
+the app must be served by a single worker process.  The ``Procfile``
+pins ``--workers 1`` because Heroku sets ``WEB_CONCURRENCY``, which
+Gunicorn would otherwise use to start several workers; concurrency
+comes from threads instead, and each game carries a lock so that
+simultaneous guesses on one game are applied one at a time.  A
+multi-worker deployment would need a shared store such as Redis behind
+``load_game_from_session``.  You can deploy this app to a platform
+like Heroku by including a ``Procfile`` and ``requirements.txt``
+listing Flask and Gunicorn as dependencies.
 """
 
+import gzip
+import hashlib
 import os
-from typing import List, Tuple
+import secrets
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 from flask import (
     Flask,
+    Response,
+    make_response,
     render_template,
     request,
     redirect,
@@ -26,57 +43,162 @@ from flask import (
 )
 
 from battleship_game import (
+    MAX_SHIPS,
     create_board,
-    place_ships,
-    update_board,
+    place_ships_mask,
+    update_cell,
 )
 
 app = Flask(__name__)
 # Set a secret key for session encryption.  In production you should
 # set the SECRET_KEY environment variable to a strong random value.
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-key")
+app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+# In-memory game store keyed by game id. The session cookie only carries
+# the id, so the board never has to be serialised or signed per request.
+# The least recently used games are evicted once MAX_GAMES is exceeded.
+MAX_GAMES = 10_000
+GAMES: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_GAMES_LOCK = threading.Lock()
 
-def initialise_game(size: int, num_ships: int) -> None:
-    """Initialise a new game and store it in the session.
+# The setup page is the same for every visitor, so browsers and proxies may
+# cache it. Its ETag changes whenever the template does.
+INDEX_MAX_AGE = 600
+_INDEX_ETAG = hashlib.md5(
+    Path(app.root_path, 'templates', 'index.html').read_bytes(),
+    usedforsecurity=False,
+).hexdigest()
+
+# Text responses at least this large are gzip compressed when the client
+# accepts it; the board markup is very repetitive and compresses well.
+GZIP_MIN_SIZE = 500
+
+
+def initialise_game(size: int, num_ships: int) -> Dict[str, Any]:
+    """Initialise a new game and link it to the session.
+
+    Any game previously linked to the session is removed from the store.
 
     Args:
         size: The chosen board size.
         num_ships: How many ships to place on the board.
+
+    Returns:
+        The new game state, which is mutated in place as play proceeds.
     """
-    board = create_board(size)
-    # Convert ship coordinates to lists for JSON serialisation
-    ships = [list(coord) for coord in place_ships(size, num_ships)]
     # Determine turn limit (same heuristic as CLI version)
     max_turns = max(size * size // num_ships, size)
-    session['game'] = {
-        'board': board,
-        'ships': ships,
+    game = {
+        'board': create_board(size),
+        'ships': place_ships_mask(size, num_ships),
         'size': size,
         'remaining_turns': max_turns,
+        # Serialises requests that play this game; see game()
+        'lock': threading.Lock(),
     }
+    old_sid = session.get('sid')
+    sid = secrets.token_urlsafe(16)
+    with _GAMES_LOCK:
+        # Starting over abandons the previous game; drop it now rather
+        # than letting it push other players' games towards eviction
+        if old_sid is not None:
+            GAMES.pop(old_sid, None)
+        GAMES[sid] = game
+        while len(GAMES) > MAX_GAMES:
+            GAMES.popitem(last=False)
+    session['sid'] = sid
+    return game
+
+
+@app.template_filter('is_ship')
+def is_ship(idx: int, ships_mask: int) -> bool:
+    """Return whether bit ``idx`` of a ships bitmask is set.
+
+    Jinja has no bitwise operators, so templates test ship bitmasks
+    through this filter: ``{{ col | is_ship(row_masks[row]) }}``.
+    """
+    return bool((ships_mask >> idx) & 1)
 
 
-def load_game_from_session() -> Tuple[
-    List[List[str]],
-    List[List[int]],
-    int,
-    int,
-]:
-    """Retrieve the game state from the session.
+@lru_cache(maxsize=16)
+def _cached_index(error: Optional[str] = None) -> str:
+    """Render the setup page, whose output depends only on ``error``."""
+    return render_template('index.html', error=error)
+
+
+def render_index(error: Optional[str] = None) -> str:
+    """Return the rendered setup page, reusing earlier renders.
+
+    Args:
+        error: An optional validation message to show above the form.
+    """
+    if app.debug:
+        # Pick up template edits while developing
+        _cached_index.cache_clear()
+    return _cached_index(error)
+
+
+def load_game_from_session() -> Optional[Dict[str, Any]]:
+    """Retrieve the game state linked to the session.
 
     Returns:
-        A tuple containing the board, ships (as list of [row, col]),
-        board size and remaining turns.
+        The game state, or ``None`` if the session has no game or it has
+        been evicted from the store.
     """
-    game = session.get('game')
-    if not game:
-        return [], [], 0, 0
-    board = game['board']
-    ships = game['ships']
-    size = game['size']
-    remaining_turns = game['remaining_turns']
-    return board, ships, size, remaining_turns
+    sid = session.get('sid')
+    if sid is None:
+        return None
+    with _GAMES_LOCK:
+        game = GAMES.get(sid)
+        if game is not None:
+            GAMES.move_to_end(sid)
+    return game
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Gzip-compress text responses for clients that accept gzip.
+
+    Streamed and file responses, non-200 responses and bodies smaller
+    than ``GZIP_MIN_SIZE`` are passed through uncompressed.  Every text
+    response, including 304s and those sent to clients that do not
+    accept gzip, carries ``Vary: Accept-Encoding`` so shared caches never
+    hand one client's encoding to another.
+
+    Args:
+        response: The response produced by the view.
+
+    Returns:
+        The (possibly compressed) response.
+    """
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or not response.mimetype.startswith('text/')
+    ):
+        return response
+    # The 200 this response stands for may be compressed for some clients
+    # and not others, so caches must key it on Accept-Encoding
+    response.vary.add('Accept-Encoding')
+    if (
+        response.status_code != 200
+        # Honours q-values, so "gzip;q=0" counts as not accepted
+        or not request.accept_encodings['gzip']
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=6, mtime=0))
+    response.headers['Content-Encoding'] = 'gzip'
+    # The compressed body is a different representation, so an ETag set
+    # by the view can only be a weak validator for it
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 
 @app.route('/', methods=['GET', 'POST'])
@@ -92,21 +214,18 @@ def index():
         except ValueError:
             # If conversion fails, redisplay the form with an error. Break
             # arguments onto separate lines to satisfy flake8.
-            return render_template(
-                'index.html',
+            return render_index(
                 error="Please enter valid numbers.",
             )
         # Validate size
         if size < 4 or size > 10:
-            return render_template(
-                'index.html',
+            return render_index(
                 error="Board size must be between 4 and 10.",
             )
         # Limit ships to roughly one quarter of the board
-        max_ships = (size * size) // 4 or 1
+        max_ships = MAX_SHIPS[size]
         if num_ships < 1 or num_ships > max_ships:
-            return render_template(
-                'index.html',
+            return render_index(
                 error=(
                     f"Number of ships must be between 1 and {max_ships}."
                 ),
@@ -114,12 +233,20 @@ def index():
         # Set the battle type to sea unconditionally (land battles removed)
         battle_type = 'sea'
         country = request.form.get('country', 'USA')
-        initialise_game(size, num_ships)
-        # Store the battle type and country in the session
-        session['game']['battle_type'] = battle_type
-        session['game']['country'] = country
+        game_data = initialise_game(size, num_ships)
+        # Store the battle type and country with the game
+        game_data['battle_type'] = battle_type
+        game_data['country'] = country
         return redirect(url_for('game'))
-    return render_template('index.html')
+    response = make_response(render_index())
+    if not app.debug:
+        # Weak, because the page may be sent gzipped or not and the
+        # 200 and 304 responses must carry the same validator
+        response.set_etag(_INDEX_ETAG, weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = INDEX_MAX_AGE
+    # Answers with 304 Not Modified if the client's ETag still matches
+    return response.make_conditional(request)
 
 
 @app.route('/game', methods=['GET', 'POST'])
@@ -128,21 +255,41 @@ def game():
 
     If no game is found in the session, redirects to the home page.
     """
-    board, ships, size, remaining_turns = load_game_from_session()
-    # Retrieve chosen battle type and country from session
-    game_data = session.get('game', {})
+    game_data = load_game_from_session()
+    if not game_data:
+        return redirect(url_for('index'))
+    # A guess reads the state, updates the board in place and writes the
+    # state back, so concurrent requests for the same game (a double
+    # clicked "Fire!", for instance) must not interleave.
+    with game_data['lock']:
+        return play_turn(game_data)
+
+
+def play_turn(game_data: Dict[str, Any]) -> str:
+    """Apply the guess in the current request (if any) and render the game.
+
+    The caller must hold ``game_data['lock']``.
+
+    Args:
+        game_data: The game state, as returned by
+            :func:`load_game_from_session`.
+
+    Returns:
+        The rendered game page.
+    """
+    board = game_data['board']
+    ships_mask = game_data['ships']
+    size = game_data['size']
+    remaining_turns = game_data['remaining_turns']
+    # Retrieve chosen battle type and country
     battle_type = game_data.get('battle_type', 'sea')
     country = game_data.get('country', '')
-    if not board:
-        return redirect(url_for('index'))
 
     message = ""
     endgame = False
     show_ships = False
-    # Convert ships list of lists to a set of tuples for update logic
-    ship_set = {tuple(coord) for coord in ships}
 
-    if request.method == 'POST' and remaining_turns > 0 and ship_set:
+    if request.method == 'POST' and remaining_turns > 0 and ships_mask:
         # Process guess
         try:
             row = int(request.form.get('row', 0)) - 1
@@ -154,24 +301,24 @@ def game():
             if row < 0 or row >= size or col < 0 or col >= size:
                 message = f"Please choose numbers between 1 and {size}."
             else:
-                hit, already_guessed = update_board(
+                idx = row * size + col
+                hit, already_guessed, ships_mask = update_cell(
                     board,
-                    (row, col),
-                    ship_set,
+                    idx,
+                    ships_mask,
                 )
-                # Convert back to list of lists for session storage
-                ships = [list(coord) for coord in ship_set]
-                # Only deduct a turn if the guess wasn't repeated
+                # Only a fresh guess changes the game state, so a repeated
+                # guess neither deducts a turn nor writes anything back.
+                # The board itself has already been updated in place.
                 if not already_guessed:
                     remaining_turns -= 1
-                    session['game']['remaining_turns'] = remaining_turns
-                    # Record the last valid guess so it can be highlighted
-                    # on the board
-                    session['game']['last_guess'] = [row, col]
-                session['game']['board'] = board
-                session['game']['ships'] = ships
-                # Mark session as modified so Flask saves nested changes
-                session.modified = True
+                    game_data.update(
+                        ships=ships_mask,
+                        remaining_turns=remaining_turns,
+                        # Record the last valid guess so it can be
+                        # highlighted on the board, packed as a flat index
+                        last_guess=idx,
+                    )
                 if already_guessed:
                     message = "You already guessed that location. Try again."
                 elif hit:
@@ -180,7 +327,7 @@ def game():
                     message = "Miss. No ship at that location."
 
     # After processing, check for win/loss conditions
-    if not ship_set:
+    if not ships_mask:
         message = "Congratulations! You sank all the battleships!"
         endgame = True
         show_ships = True
@@ -189,30 +336,41 @@ def game():
         endgame = True
         show_ships = True
 
-    # Pass the ships as a set of tuples for template checking
-    ship_tuples: set[Tuple[int, int]] = {tuple(coord) for coord in ships}
+    # Split the remaining ships into one small bitmask per row so the
+    # template tests a single bit of a short int for each cell
+    row_masks = []
+    if show_ships:
+        full_row = (1 << size) - 1
+        row_masks = [
+            (ships_mask >> (r * size)) & full_row for r in range(size)
+        ]
 
     # Retrieve the last guess (if any) for highlighting
     last_guess = None
-    lg = session['game'].get('last_guess')
-    if isinstance(lg, list) and len(lg) == 2:
-        last_guess = tuple(lg)
+    lg = game_data.get('last_guess')
+    if lg is not None:
+        last_guess = divmod(lg, size)
 
     return render_template(
         'game.html',
-        board=board,
+        board=board.decode(),
         size=size,
         message=message,
         remaining_turns=remaining_turns,
         endgame=endgame,
         show_ships=show_ships,
-        ships=ship_tuples,
+        row_masks=row_masks,
         battle_type=battle_type,
         country=country,
         last_guess=last_guess,
     )
 
 
+# WSGI entry point for Gunicorn (see Procfile).  Binding the bound method
+# once skips the ``Flask.__call__`` indirection on every request.
+application = app.wsgi_app
+
+
 if __name__ == '__main__':
     # Enable debug mode when running locally
     app.run(debug=True)
@@ -27,23 +27,61 @@ manage invalid input, ensuring a smooth user experience.
 from __future__ import annotations
 
 import random
+import sys
+from functools import lru_cache
 from typing import List, Set, Tuple
 
+# Byte values stored in each board cell: untouched water, a hit and a miss.
+EMPTY, HIT, MISS = ord(' '), ord('X'), ord('O')
+# Cells that have already been fired at.
+_GUESSED = frozenset((HIT, MISS))
+# Mark to write for a guess, indexed by the ship bit (0 = miss, 1 = hit).
+_MARK = (MISS, HIT)
+# Largest number of ships allowed for each supported board size (4 to 10):
+# roughly one quarter of the board, but always at least one.
+MAX_SHIPS = {size: max(size * size // 4, 1) for size in range(4, 11)}
 
-def create_board(size: int) -> List[List[str]]:
-    """Return an empty game board represented as a 2D list.
 
-    Each cell is initialised with a space (' ') character. The board
-    uses zero‑based indexing internally, but user interactions assume
-    one‑based row and column numbers.
+def create_board(size: int) -> bytearray:
+    """Return an empty game board represented as a flat bytearray.
+
+    The board holds ``size * size`` cells in row‑major order, so the
+    cell at (row, col) lives at index ``row * size + col``. Each cell is
+    initialised to ``EMPTY`` (a space). The board uses zero‑based
+    indexing internally, but user interactions assume one‑based row and
+    column numbers.
 
     Args:
         size: The dimension of the square board (number of rows and columns).
 
     Returns:
-        A list of lists containing strings.
+        A bytearray of length ``size * size``.
     """
-    return [[' ' for _ in range(size)] for _ in range(size)]
+    return bytearray([EMPTY]) * (size * size)
+
+
+def _sample_cells(board_size: int, number_of_ships: int) -> List[int]:
+    """Return distinct random flat cell indices for the given ship count.
+
+    Sampling without replacement guarantees distinct cells from a single
+    ``random.sample`` call, so there is no retry loop and only one RNG
+    call however crowded the board is.
+
+    Args:
+        board_size: The size of one side of the square board.
+        number_of_ships: How many cells to choose.
+
+    Returns:
+        A list of indices in the range ``0 .. board_size ** 2 - 1``.
+    """
+    if number_of_ships > board_size * board_size:
+        # Break the error message across two lines to satisfy the flake8
+        # maximum line length recommendation (79 characters per line).
+        raise ValueError(
+            "Number of ships cannot exceed the total number of squares "
+            "on the board."
+        )
+    return random.sample(range(board_size * board_size), number_of_ships)
 
 
 def place_ships(board_size: int, number_of_ships: int) -> Set[Tuple[int, int]]:
@@ -61,25 +99,46 @@ def place_ships(board_size: int, number_of_ships: int) -> Set[Tuple[int, int]]:
     Returns:
         A set of tuples, each containing a row and column index.
     """
-    if number_of_ships > board_size * board_size:
-        # Break the error message across two lines to satisfy the flake8
-        # maximum line length recommendation (79 characters per line).
-        raise ValueError(
-            "Number of ships cannot exceed the total number of squares "
-            "on the board."
-        )
-    ships: Set[Tuple[int, int]] = set()
-    while len(ships) < number_of_ships:
-        row = random.randint(0, board_size - 1)
-        col = random.randint(0, board_size - 1)
-        ships.add((row, col))
-    return ships
+    return {
+        divmod(idx, board_size)
+        for idx in _sample_cells(board_size, number_of_ships)
+    }
+
+
+def place_ships_mask(board_size: int, number_of_ships: int) -> int:
+    """Randomly choose ship positions and return them as a bitmask.
+
+    Bit ``row * board_size + col`` of the returned integer is set for
+    every cell holding a ship, matching the layout of the flat board
+    returned by :func:`create_board`. Ships never overlap.
+
+    Args:
+        board_size: The size of one side of the square board.
+        number_of_ships: How many ships to place on the board.
+
+    Returns:
+        An integer with one bit set per ship.
+    """
+    mask = 0
+    for idx in _sample_cells(board_size, number_of_ships):
+        mask |= 1 << idx
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _board_header(size: int) -> str:
+    """Return the column numbers and divider shown above a board."""
+    return (
+        "   " + " ".join(f"{col+1:>2}" for col in range(size)) + "\n"
+        + "  " + "―" * (3 * size)
+    )
 
 
 def display_board(
-    board: List[List[str]],
+    board: bytearray,
+    size: int,
     show_ships: bool = False,
-    ships: Set[Tuple[int, int]] | None = None,
+    ships: int = 0,
 ) -> None:
     """Print the current state of the game board to the console.
 
@@ -88,32 +147,36 @@ def display_board(
     along the top to aid the user in making guesses.
 
     Args:
-        board: The 2D list representing the current state of the game.
+        board: The flat bytearray representing the current state of the game.
+        size: The size of one side of the square board.
         show_ships: If True, any unhit ships will be displayed as 'S'.
-        ships: A set of ship positions. Required if `show_ships` is True.
+        ships: A bitmask of ship positions. Required if `show_ships` is
+            True.
     """
-    size = len(board)
-    # Column header
-    header = "   " + " ".join(f"{col+1:>2}" for col in range(size))
-    print(header)
-    print("  " + "―" * (3 * size))
-    for row_index, row in enumerate(board):
-        row_display = f"{row_index + 1:>2}|"
-        for col_index, cell in enumerate(row):
-            # Reveal ships if requested and the cell hasn't been guessed.  The
-            # conditional is broken across multiple lines to satisfy flake8's
-            # maximum line length rule.
-            if (
-                show_ships
-                and ships
-                and (row_index, col_index) in ships
-                and cell == ' '
-            ):
-                row_display += " S "
-            else:
-                row_display += f" {cell} "
-        print(row_display)
-    print()  # Blank line for spacing
+    if show_ships and ships:
+        # Reveal ships on a copy of the board, visiting only the set bits
+        # of the mask rather than testing every cell.
+        board = bytearray(board)
+        while ships:
+            lowest = ships & -ships
+            idx = lowest.bit_length() - 1
+            if board[idx] == EMPTY:
+                board[idx] = ord('S')
+            ships ^= lowest
+    cells = board.decode()
+    # Build the whole board and write it with a single call rather than
+    # printing each row separately.  Joining a row's characters with two
+    # spaces gives the " a  b  c " cell layout without a per-cell loop.
+    lines = [_board_header(size)]
+    for row_index in range(size):
+        offset = row_index * size
+        lines.append(
+            f"{row_index + 1:>2}| "
+            + "  ".join(cells[offset:offset + size])
+            + " "
+        )
+    # Trailing blank line for spacing
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
 def get_integer_input(prompt: str, min_value: int, max_value: int) -> int:
@@ -121,7 +184,7 @@ def get_integer_input(prompt: str, min_value: int, max_value: int) -> int:
 
     Continues to prompt until the user enters a valid integer between
     `min_value` and `max_value` inclusive. Handles non‑numeric input
-    gracefully.
+    gracefully by validating the characters before conversion.
 
     Args:
         prompt: The message displayed to the user.
@@ -133,11 +196,14 @@ def get_integer_input(prompt: str, min_value: int, max_value: int) -> int:
     """
     while True:
         user_input = input(prompt).strip()
-        try:
-            value = int(user_input)
-        except ValueError:
+        # Check the characters up front instead of letting int() raise and
+        # catching the ValueError.  isdecimal() accepts exactly the digits
+        # that int() does.
+        digits = user_input[1:] if user_input[:1] in ('+', '-') else user_input
+        if not digits.isdecimal():
             print("Invalid input. Please enter a whole number.")
             continue
+        value = int(user_input)
         if value < min_value or value > max_value:
             # Break the f-string onto two lines to satisfy line length limits
             print(
@@ -202,37 +268,59 @@ def get_guess(size: int) -> Tuple[int, int]:
 
 
 def update_board(
-    board: List[List[str]], guess: Tuple[int, int], ships: Set[Tuple[int, int]]
-) -> Tuple[bool, bool]:
+    board: bytearray,
+    size: int,
+    guess: Tuple[int, int],
+    ships_mask: int,
+) -> Tuple[bool, bool, int]:
     """Update the board based on the player's guess.
 
     Marks a hit with 'X' and a miss with 'O'. If the guess is a hit,
-    the ship is removed from the `ships` set. The function returns
-    whether the guess was a hit, and whether the cell had already been
-    guessed previously.
+    the ship's bit is cleared from the returned mask. The function
+    returns whether the guess was a hit, whether the cell had already
+    been guessed previously, and the updated ships mask.
 
     Args:
         board: The current state of the game board.
+        size: The size of one side of the square board.
         guess: A tuple containing the guessed (row, col) indices.
-        ships: A set of remaining ship positions.
+        ships_mask: A bitmask of remaining ship positions.
 
     Returns:
-        A tuple of booleans:
+        A tuple containing:
         - hit: True if the guess is a hit, False otherwise.
         - already_guessed: True if the cell was previously guessed.
+        - ships_mask: The remaining ship positions after this guess.
     """
     row, col = guess
-    cell_value = board[row][col]
-    if cell_value in ('X', 'O'):
+    return update_cell(board, row * size + col, ships_mask)
+
+
+def update_cell(
+    board: bytearray, idx: int, ships_mask: int
+) -> Tuple[bool, bool, int]:
+    """Update the board for a guess given as a flat cell index.
+
+    This is the size-independent core of :func:`update_board`, for
+    callers that already hold the index ``row * size + col``.
+
+    Args:
+        board: The current state of the game board.
+        idx: The flat index of the guessed cell.
+        ships_mask: A bitmask of remaining ship positions.
+
+    Returns:
+        The same ``(hit, already_guessed, ships_mask)`` tuple as
+        :func:`update_board`.
+    """
+    if board[idx] in _GUESSED:
         # Player guessed this cell before
-        return False, True
-    if (row, col) in ships:
-        board[row][col] = 'X'
-        ships.remove((row, col))
-        return True, False
-    # It's a miss
-    board[row][col] = 'O'
-    return False, False
+        return False, True, ships_mask
+    # Look the mark up from the ship bit instead of branching on it; a
+    # miss clears nothing from the mask.
+    hit = (ships_mask >> idx) & 1
+    board[idx] = _MARK[hit]
+    return bool(hit), False, ships_mask & ~(hit << idx)
 
 
 def game_loop() -> None:
@@ -246,14 +334,10 @@ def game_loop() -> None:
     print("Welcome to Battleships!")
     size = get_board_size()
 
-    # Limit the number of ships to roughly one quarter of the board
-    max_possible_ships = (size * size) // 4
-    if max_possible_ships < 1:
-        max_possible_ships = 1
-    num_ships = get_number_of_ships(max_possible_ships)
+    num_ships = get_number_of_ships(MAX_SHIPS[size])
 
     board = create_board(size)
-    ships = place_ships(size, num_ships)
+    ships = place_ships_mask(size, num_ships)
     # Set number of turns.
     # Basic heuristic: twice the number of squares divided by number of ships.
     max_turns = max(size * size // num_ships, size)
@@ -263,19 +347,16 @@ def game_loop() -> None:
     ship_word = "ship" if num_ships == 1 else "ships"
     print(
         f"The computer has hidden {num_ships} {ship_word} on a "
-        f"{size}×{size} board."
-    )
-    # Wrap the message onto two lines to conform to flake8's line length limit.
-    print(
+        f"{size}×{size} board.\n"
         f"You have {max_turns} turns to sink them all. Good luck!\n"
     )
 
     turns_taken = 0
     while turns_taken < max_turns and ships:
         print(f"Turn {turns_taken + 1} of {max_turns}")
-        display_board(board)
+        display_board(board, size)
         guess = get_guess(size)
-        hit, already_guessed = update_board(board, guess, ships)
+        hit, already_guessed, ships = update_board(board, size, guess, ships)
         if already_guessed:
             print("You already guessed that location. Try a different one.\n")
             # Do not count this as a turn
@@ -290,8 +371,8 @@ def game_loop() -> None:
         print("Congratulations! You sank all the battleships!")
     else:
         print("Game over! You ran out of turns.")
-        print(f"Ships remaining: {len(ships)}")
-        display_board(board, show_ships=True, ships=ships)
+        print(f"Ships remaining: {ships.bit_count()}")
+        display_board(board, size, show_ships=True, ships=ships)
 
 
 if __name__ == "__main__":
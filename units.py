@@ -11,10 +11,10 @@ adding more complex behaviour (e.g. different attack patterns for
 submarines vs tanks).
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     """Base class for all unit types."""
     name: str
@@ -37,72 +37,50 @@ class Unit:
         return self.health <= 0
 
 
-@dataclass
+# Subclasses re-declare the inherited fields with their own defaults so the
+# generated ``__init__`` can be called without arguments.  This needs Python
+# 3.11+: earlier versions give each subclass duplicate slots for the
+# re-declared fields instead of reusing the ones ``Unit`` already has.
+
+
+@dataclass(slots=True)
 class Ship(Unit):
     """A generic naval ship."""
+    name: str = "Ship"
+    health: int = 1
+    attack_range: int = 1
     length: int = 1
 
-    def __init__(
-        self,
-        name: str = "Ship",
-        health: int = 1,
-        attack_range: int = 1,
-        length: int = 1,
-    ) -> None:
-        super().__init__(name, health, attack_range)
-        self.length = length
-
 
-@dataclass
+@dataclass(slots=True)
 class Submarine(Unit):
     """Represents a submarine with stealth capabilities."""
-    submerged: bool = True
+    name: str = "Submarine"
+    health: int = 1
+    attack_range: int = 1
+    submerged: bool = field(default=True, init=False)
 
-    def __init__(
-        self,
-        name: str = "Submarine",
-        health: int = 1,
-        attack_range: int = 1,
-    ) -> None:
-        super().__init__(name, health, attack_range)
-        self.submerged = True
 
-
-@dataclass
+@dataclass(slots=True)
 class Tank(Unit):
     """Represents a land tank unit."""
+    name: str = "Tank"
+    health: int = 3
+    attack_range: int = 1
     armour: int = 2
 
-    def __init__(
-        self,
-        name: str = "Tank",
-        health: int = 3,
-        attack_range: int = 1,
-        armour: int = 2,
-    ) -> None:
-        super().__init__(name, health, attack_range)
-        self.armour = armour
-
 
-@dataclass
+@dataclass(slots=True)
 class Infantry(Unit):
     """Represents infantry troops."""
-    def __init__(
-        self,
-        name: str = "Infantry",
-        health: int = 1,
-        attack_range: int = 1,
-    ) -> None:
-        super().__init__(name, health, attack_range)
+    name: str = "Infantry"
+    health: int = 1
+    attack_range: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Artillery(Unit):
     """Represents an artillery unit with long range."""
-    def __init__(
-        self,
-        name: str = "Artillery",
-        health: int = 2,
-        attack_range: int = 3,
-    ) -> None:
-        super().__init__(name, health, attack_range)
+    name: str = "Artillery"
+    health: int = 2
+    attack_range: int = 3